@@ -0,0 +1,208 @@
+from multiprocessing.connection import Listener
+from time import sleep, time
+import argparse
+import json
+import os
+import random
+
+from Records.Records import RecordBuffer, SWEEP_DTYPE
+
+
+class BenchWorker:
+    def __init__(self, windfreak_config=None, anritsu_address='TCPIP::6.1.1.91::inst0::INSTR',
+                 labjack_channel=4, channel=0, frequency=6834.682e6, marker=1,
+                 settle_time=1.0, average_num=60):
+        """
+        One bench: a SynthHD, an MS2721B and a U3 driven through the existing classes
+        :param windfreak_config: Keyword arguments for WindfreakInitializer
+        :param anritsu_address: VISA resource address of the spectrum analyzer
+        :param labjack_channel: LabJack analog input wired to the photodiode
+        :param channel: Windfreak output channel being swept
+        :param frequency: Windfreak output frequency in Hz
+        :param marker: Spectrum analyzer marker read for the MW power
+        :param settle_time: Delay after each power change in seconds
+        :param average_num: Number of samples taken per setpoint
+        """
+        self.windfreak_config = windfreak_config or {'port': 'COM11'}
+        self.anritsu_address = anritsu_address
+        self.labjack_channel = labjack_channel
+        self.channel = channel
+        self.frequency = frequency
+        self.marker = marker
+        self.settle_time = settle_time
+        self.average_num = average_num
+        self.records = RecordBuffer(SWEEP_DTYPE, chunk_size=max(average_num, 1))
+        self.wf = None
+        self.sa = None
+        self.lj = None
+
+    def open(self):
+        """Connect and configure all instruments of this bench"""
+        # Imported here so fake benches run without the vendor libraries
+        from Windfreak.Windfreak import WindfreakInitializer
+        from AnritsuMS2712B.AnritsuMS2721B import AnritsuMS2721B
+        from LabJack.LabJack import LabJackReader
+
+        self.wf = WindfreakInitializer(**self.windfreak_config)
+        self.wf.connect()
+        self.wf.configure_device()
+        self.wf.configure_channel(channel=self.channel, frequency=self.frequency, enable=True)
+        self.sa = AnritsuMS2721B(self.anritsu_address)
+        self.lj = LabJackReader(device_type="U3")
+
+    def close(self):
+        """Release all instruments of this bench"""
+        if self.wf:
+            self.wf.disconnect()
+            self.wf = None
+        if self.sa:
+            self.sa.close()
+            self.sa = None
+        if self.lj:
+            self.lj.close()
+            self.lj = None
+
+    def set_power(self, power):
+        """Set the swept output power in dBm"""
+        self.wf.synth[self.channel].power = power
+
+    def read_sample(self):
+        """Return (PD DC voltage in V, PD MW power in dBm)"""
+        voltage = self.lj.read_voltage(channel=self.labjack_channel)
+        return (float('nan') if voltage is None else voltage), self.sa.get_marker_y(self.marker)
+
+    def measure(self, setpoint):
+        """
+        Take average_num samples at one output power
+        :param setpoint: Output power in dBm
+        :return: Mapping of SWEEP_DTYPE field name to sample arrays, copied
+                 out of the reused record buffer
+        """
+        self.set_power(setpoint)
+        sleep(self.settle_time)
+        records = self.records
+        records.clear()
+        for _ in range(self.average_num):
+            dc_voltage, mw_power = self.read_sample()
+            records.append(time(), setpoint, dc_voltage, mw_power)
+        return {name: column.copy() for name, column in records.columns().items()}
+
+
+class FakeBenchWorker(BenchWorker):
+    def __init__(self, settle_time=0.0, average_num=10, insertion_loss=3.0,
+                 responsivity=0.5, noise=0.01, fail_after=None, **kwargs):
+        """
+        Bench without hardware, for testing the coordinator
+        :param insertion_loss: dB between the synthesizer and the analyzer
+        :param responsivity: Photodiode DC response in V/mW
+        :param noise: Standard deviation of the simulated noise
+        :param fail_after: Crash the worker process after this many setpoints
+        """
+        super().__init__(settle_time=settle_time, average_num=average_num, **kwargs)
+        self.insertion_loss = insertion_loss
+        self.responsivity = responsivity
+        self.noise = noise
+        self.fail_after = fail_after
+        self.power = None
+        self._measured = 0
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def set_power(self, power):
+        self.power = power
+
+    def read_sample(self):
+        mw_power = self.power - self.insertion_loss + random.gauss(0, self.noise)
+        return self.responsivity * 10 ** (mw_power / 10), mw_power
+
+    def measure(self, setpoint):
+        if self.fail_after is not None and self._measured >= self.fail_after:
+            os._exit(1)  # Simulate a crashed bench, no reply is sent
+        self._measured += 1
+        return super().measure(setpoint)
+
+
+def serve_connection(conn, worker):
+    """
+    Answer coordinator requests on one connection until it closes
+    Requests are ('measure', index, setpoint) and ('close',); replies are
+    ('ok', index, columns) or ('error', index, message).
+    Returns quietly when the coordinator goes away, so serve can accept the next one.
+    """
+    try:
+        conn.send(('ready',))
+        while True:
+            request = conn.recv()
+            if request[0] == 'close':
+                return
+            _, index, setpoint = request
+            try:
+                reply = ('ok', index, worker.measure(setpoint))
+            except Exception as e:
+                reply = ('error', index, f"{type(e).__name__}: {e}")
+            conn.send(reply)
+    except (OSError, EOFError):
+        return
+
+
+def run_local(conn, worker_class, config):
+    """Process entry point for a bench worker owned by the coordinator"""
+    worker = None
+    try:
+        worker = worker_class(**config)
+        worker.open()
+    except Exception as e:
+        conn.send(('error', None, f"{type(e).__name__}: {e}"))
+        # Release whatever open() got to, e.g. a synthesizer already outputting
+        if worker is not None:
+            worker.close()
+        conn.close()
+        return
+    try:
+        serve_connection(conn, worker)
+    finally:
+        worker.close()
+        conn.close()
+
+
+def serve(worker, host='0.0.0.0', port=6000, authkey=b'bench'):
+    """
+    Expose a bench worker over an RPC socket, one coordinator at a time
+    :param worker: BenchWorker (or subclass) instance
+    :param host: Interface to listen on
+    :param port: TCP port to listen on
+    :param authkey: Shared secret, must match the coordinator
+    """
+    try:
+        worker.open()
+        with Listener((host, port), authkey=authkey) as listener:
+            print(f"Bench worker listening on {host}:{port}")
+            while True:
+                with listener.accept() as conn:
+                    print(f"Coordinator connected from {listener.last_accepted}")
+                    serve_connection(conn, worker)
+    finally:
+        worker.close()
+
+
+# Example usage: python -m Bench.Bench --config bench1.json --port 6000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve one bench to a BenchCoordinator")
+    parser.add_argument('--config', help="JSON file with BenchWorker keyword arguments")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=6000)
+    parser.add_argument('--authkey', default='bench')
+    parser.add_argument('--fake', action='store_true', help="Serve a FakeBenchWorker")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    worker = (FakeBenchWorker if args.fake else BenchWorker)(**config)
+    serve(worker, host=args.host, port=args.port, authkey=args.authkey.encode())
@@ -0,0 +1,189 @@
+import multiprocessing
+from multiprocessing.connection import Client
+import queue
+import threading
+
+import numpy as np
+
+from Bench.Bench import BenchWorker, run_local
+from Records.Records import RecordBuffer, BENCH_SWEEP_DTYPE
+
+
+class BenchCoordinator:
+    def __init__(self, local=(), remote=(), worker_class=BenchWorker, authkey=b'bench',
+                 timeout=600, max_retries=3):
+        """
+        Split a sweep across several benches and merge the results
+        :param local: BenchWorker keyword-argument dicts, one worker process each
+        :param remote: (host, port) addresses of workers started with Bench.serve
+        :param worker_class: Worker class used for the local processes
+        :param authkey: Shared secret of the remote workers
+        :param timeout: Maximum time for a single setpoint in seconds
+        :param max_retries: Times a setpoint is re-queued before the sweep fails
+        """
+        if not local and not remote:
+            raise ValueError("At least one local or remote bench is required")
+        self.local = list(local)
+        self.remote = list(remote)
+        self.worker_class = worker_class
+        self.authkey = authkey
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.failures = []  # (bench name, message) for every lost request of the last run
+
+    def run(self, setpoints):
+        """
+        Measure every setpoint on whichever bench is free
+        :param setpoints: Iterable of output powers in dBm
+        :return: RecordBuffer of BENCH_SWEEP_DTYPE with all samples ordered by
+                 setpoint, each tagged with the name of the bench that measured it
+        """
+        setpoints = list(setpoints)
+        self.failures = []
+        pending = queue.Queue()
+        for index, setpoint in enumerate(setpoints):
+            pending.put((index, setpoint))
+
+        state = {
+            'pending': pending,
+            'results': [None] * len(setpoints),
+            'attempts': [0] * len(setpoints),
+            'remaining': len(setpoints),
+            'error': None,
+            'lock': threading.Lock(),
+            'done': threading.Event(),
+        }
+        if not setpoints:
+            state['done'].set()
+
+        threads = [threading.Thread(target=self._drive_local, args=(config, state),
+                                    name=f"local-{i}", daemon=True)
+                   for i, config in enumerate(self.local)]
+        threads += [threading.Thread(target=self._drive_remote, args=(address, state),
+                                     name=f"{address[0]}:{address[1]}", daemon=True)
+                    for address in self.remote]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if state['error']:
+            raise RuntimeError(state['error'])
+        if state['remaining']:
+            raise RuntimeError(f"All benches failed with {state['remaining']} "
+                               f"of {len(setpoints)} setpoints left: {self.failures}")
+
+        records = RecordBuffer(BENCH_SWEEP_DTYPE, chunk_size=max(
+            sum(len(columns['time']) for columns in state['results']), 1))
+        for columns in state['results']:
+            records.extend(columns)
+        return records
+
+    def _drive_local(self, config, state):
+        """Run one local worker process and feed it setpoints"""
+        # Spawn so sibling workers do not inherit this pipe and hide a crash
+        ctx = multiprocessing.get_context('spawn')
+        conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=run_local, args=(child_conn, self.worker_class, config),
+                          daemon=True)
+        process.start()
+        child_conn.close()
+        try:
+            self._drive(conn, state)
+        finally:
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def _drive_remote(self, address, state):
+        """Connect to one remote worker and feed it setpoints"""
+        try:
+            conn = Client(tuple(address), authkey=self.authkey)
+        except (OSError, EOFError) as e:
+            self._fail(f"{type(e).__name__}: {e}")
+            return
+        try:
+            self._drive(conn, state)
+        finally:
+            conn.close()
+
+    def _drive(self, conn, state):
+        """Request/reply loop shared by local and remote workers"""
+        try:
+            if not conn.poll(self.timeout):
+                raise TimeoutError("Bench did not become ready")
+            reply = conn.recv()
+        except (OSError, EOFError) as e:
+            self._fail(f"{type(e).__name__}: {e}")
+            return
+        if reply[0] != 'ready':
+            self._fail(reply[2])
+            return
+
+        pending, done = state['pending'], state['done']
+        while not done.is_set():
+            try:
+                index, setpoint = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                conn.send(('measure', index, setpoint))
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"No reply for setpoint {setpoint}")
+                status, _, payload = conn.recv()
+            except (OSError, EOFError) as e:
+                # Bench is gone: hand the point to another bench and stop driving this one
+                self._requeue(index, setpoint, state, f"{type(e).__name__}: {e}")
+                return
+            if status == 'ok':
+                with state['lock']:
+                    columns = {name: np.asarray(column) for name, column in payload.items()}
+                    columns['bench'] = np.full(len(columns['time']),
+                                               threading.current_thread().name)
+                    state['results'][index] = columns
+                    state['remaining'] -= 1
+                    if not state['remaining']:
+                        done.set()
+            else:
+                self._requeue(index, setpoint, state, payload)
+
+        try:
+            conn.send(('close',))
+        except OSError:
+            pass
+
+    def _requeue(self, index, setpoint, state, message):
+        """Put a failed setpoint back, or abort the sweep once it ran out of retries"""
+        self._fail(message)
+        with state['lock']:
+            state['attempts'][index] += 1
+            if state['attempts'][index] > self.max_retries:
+                state['error'] = (f"Setpoint {setpoint} failed {state['attempts'][index]} "
+                                  f"times, last error: {message}")
+                state['done'].set()
+                return
+        state['pending'].put((index, setpoint))
+
+    def _fail(self, message):
+        """Record why a bench dropped a request"""
+        self.failures.append((threading.current_thread().name, message))
+        print(f"Bench {threading.current_thread().name}: {message}")
+
+
+# Example usage
+if __name__ == "__main__":
+    from time import perf_counter
+    from Bench.Bench import FakeBenchWorker
+
+    setpoints = np.linspace(-10, 16, 27)
+    coordinator = BenchCoordinator(
+        local=[{'settle_time': 0.1}, {'settle_time': 0.1}, {'settle_time': 0.1, 'fail_after': 3}],
+        worker_class=FakeBenchWorker
+    )
+    start = perf_counter()
+    records = coordinator.run(setpoints)
+    print(f"Collected {len(records)} samples in {perf_counter() - start:.2f} s")
+    benches, counts = np.unique(records.column('bench'), return_counts=True)
+    print(f"Samples per bench: {dict(zip(benches.tolist(), counts.tolist()))}")
+    print(f"Lost requests: {coordinator.failures}")
@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+# Sweep sample schema, one row per averaged reading
+SWEEP_DTYPE = np.dtype([
+    ('time', 'f8'),             # Unix timestamp in seconds
+    ('output_mw_power', 'f8'),  # dBm
+    ('pd_dc_voltage', 'f8'),    # V
+    ('pd_mw_power', 'f8'),      # dBm
+])
+
+# Sweep sample schema tagged with the bench that measured it
+BENCH_SWEEP_DTYPE = np.dtype(SWEEP_DTYPE.descr + [('bench', 'U64')])
+
+
+class WaveformMeta(Mapping):
+    """Acquisition settings of one waveform capture, readable like a dict"""
+    __slots__ = ('channel', 'vdiv', 'offset', 'tdiv', 'sample_rate', 'points', 'segments')
+
+    def __init__(self, channel=None, vdiv=None, offset=None, tdiv=None,
+                 sample_rate=None, points=0, segments=1):
+        self.channel = channel
+        self.vdiv = vdiv
+        self.offset = offset
+        self.tdiv = tdiv
+        self.sample_rate = sample_rate
+        self.points = points
+        self.segments = segments
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"WaveformMeta({dict(self)})"
+
+
+class RecordBuffer:
+    __slots__ = ('dtype', 'chunk_size', '_columns', '_size')
+
+    def __init__(self, dtype=SWEEP_DTYPE, chunk_size=4096):
+        """
+        Pre-allocated, chunk-growing record store
+        :param dtype: Structured NumPy dtype describing one record
+        :param chunk_size: Number of records added each time the buffer grows
+        """
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        # One contiguous array per field so columns hand over to pandas without copying
+        self._columns = tuple(np.empty(chunk_size, dtype=self.dtype[name])
+                              for name in self.dtype.names)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._columns[0].shape[0]
+
+    def append(self, *values):
+        """Write one record in field order into the next free slot"""
+        if len(values) != len(self._columns):
+            raise ValueError(f"Expected {len(self._columns)} values, got {len(values)}")
+        if self._size == self.capacity:
+            self._grow(self.chunk_size)
+        idx = self._size
+        for column, value in zip(self._columns, values):
+            column[idx] = value
+        self._size = idx + 1
+
+    def extend(self, columns):
+        """
+        Append many records at once
+        :param columns: Mapping of field name to equal-length arrays
+        """
+        count = len(columns[self.dtype.names[0]])
+        missing = self._size + count - self.capacity
+        if missing > 0:
+            self._grow(missing)
+        for name, column in zip(self.dtype.names, self._columns):
+            column[self._size:self._size + count] = columns[name]
+        self._size += count
+
+    def _grow(self, extra):
+        """Enlarge every column by at least extra records, doubling to keep copies amortized"""
+        capacity = max(self.capacity * 2, self.capacity + extra)
+        grown = []
+        for column in self._columns:
+            new = np.empty(capacity, dtype=column.dtype)
+            new[:self._size] = column[:self._size]
+            grown.append(new)
+        self._columns = tuple(grown)
+
+    def clear(self):
+        """Drop all records but keep the allocated memory"""
+        self._size = 0
+
+    def column(self, name):
+        """View of the filled part of a field"""
+        return self._columns[self.dtype.names.index(name)][:self._size]
+
+    def columns(self):
+        """Views of all filled fields keyed by name"""
+        return {name: column[:self._size]
+                for name, column in zip(self.dtype.names, self._columns)}
+
+    def to_array(self):
+        """Copy the records into a structured array"""
+        out = np.empty(self._size, dtype=self.dtype)
+        for name, column in zip(self.dtype.names, self._columns):
+            out[name] = column[:self._size]
+        return out
+
+    def to_dataframe(self):
+        """Wrap the filled columns in a pandas DataFrame without copying"""
+        import pandas as pd
+        return pd.DataFrame(self.columns(), copy=False)
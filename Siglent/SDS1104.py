@@ -2,6 +2,8 @@ import socket
 import time
 import numpy as np
 
+from Records.Records import WaveformMeta
+
 class SiglentScopeSocket:
     def __init__(self, ip_address, port=5025, timeout=5, buffer_size=4096):
         self.ip = ip_address
@@ -95,10 +97,11 @@ class SiglentScopeSocket:
             time.sleep(0.1)
 
         # Get waveform parameters
-        vdiv = self._parse_numeric_response(self.query(f":C{channel}:VOLT_DIV?"))
-        offset = self._parse_numeric_response(self.query(f":C{channel}:OFFSET?"))
-        tdiv = self._parse_numeric_response(self.query(":TIM:MAIN:SCAL?"))
-        samp_rate = self._parse_numeric_response(self.query(":ACQ:SRAT?"))
+        meta = WaveformMeta(channel=channel)
+        meta.vdiv = self._parse_numeric_response(self.query(f":C{channel}:VOLT_DIV?"))
+        meta.offset = self._parse_numeric_response(self.query(f":C{channel}:OFFSET?"))
+        meta.tdiv = self._parse_numeric_response(self.query(":TIM:MAIN:SCAL?"))
+        meta.sample_rate = self._parse_numeric_response(self.query(":ACQ:SRAT?"))
 
         # Get raw waveform data
         self.send(":WAV:DATA?")
@@ -108,23 +111,16 @@ class SiglentScopeSocket:
         y_origin = self._parse_numeric_response(self.query(":WAV:YOR?"))
         y_ref = self._parse_numeric_response(self.query(":WAV:YREF?"))
         y_inc = self._parse_numeric_response(self.query(":WAV:YINC?"))
-        voltages = (np.array(raw_data) - y_origin - y_ref) * y_inc + offset
+        voltages = (raw_data - y_origin - y_ref) * y_inc + meta.offset
         
         # Create time array
         x_inc = self._parse_numeric_response(self.query(":WAV:XINC?"))
         time_array = np.arange(0, len(voltages)) * x_inc
         time_array -= float(self.query(":TIM:OFFS?"))  # Adjust trigger position
         
-        metadata = {
-            'channel': channel,
-            'vdiv': vdiv,
-            'offset': offset,
-            'tdiv': tdiv,
-            'sample_rate': samp_rate,
-            'points': len(voltages)
-        }
+        meta.points = len(voltages)
         
-        return time_array, voltages, metadata
+        return time_array, voltages, meta
 
     def _get_binary_data(self):
         """Handle binary waveform data transfer"""
@@ -134,13 +130,17 @@ class SiglentScopeSocket:
         header = header.split(',')[1]
         data_size = int(header[1:])
         
-        # Read binary data
-        raw_data = bytearray()
-        while len(raw_data) < data_size:
-            remaining = data_size - len(raw_data)
-            raw_data += self.sock.recv(min(remaining, self.buffer_size))
+        # Read binary data straight into a pre-allocated array
+        raw_data = np.empty(data_size, dtype=np.uint8)
+        view = memoryview(raw_data)
+        received = 0
+        while received < data_size:
+            count = self.sock.recv_into(view[received:], min(data_size - received, self.buffer_size))
+            if not count:
+                raise ConnectionError("Connection closed during waveform transfer")
+            received += count
         
-        return list(raw_data)
+        return raw_data
 
     def __enter__(self):
         self.connect()
@@ -149,7 +149,7 @@ class SiglentScopeSocket:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disconnect()
 
-# Usage example
+# Usage example, run from the repository root: python -m Siglent.SDS1104
 if __name__ == "__main__":
     SCOPE_IP = "6.1.1.92"  # Replace with your scope's IP
     
@@ -1,11 +1,16 @@
 import pyvisa
 import time
+import numpy as np
+
+from Records.Records import WaveformMeta
 
 class SiglentScope:
     def __init__(self, visa_address):
         self.visa_address = visa_address
         self.rm = pyvisa.ResourceManager()
         self.instr = None
+        self.meta = None  # WaveformMeta of the last capture
+        self.segments = None  # Segment count set by configure_sequence
         self._sara_units = {'G': 1e9, 'M': 1e6, 'k': 1e3}
 
     def connect(self):
@@ -47,6 +52,16 @@ class SiglentScope:
                 return float(parts[0]) * multiplier
         return float(sara_response)
 
+    def _read_meta(self, channel):
+        """Query vertical and horizontal settings into a new WaveformMeta"""
+        return WaveformMeta(
+            channel=channel,
+            vdiv=self._parse_parameter(self.instr.query(f"c{channel}:vdiv?")),
+            offset=self._parse_parameter(self.instr.query(f"c{channel}:ofst?")),
+            tdiv=self._parse_parameter(self.instr.query("tdiv?")),
+            sample_rate=self._parse_sara(self.instr.query("sara?"))
+        )
+
     def get_waveform(self, channel=1):
         """Acquire and process waveform data from specified channel"""
         if not self.instr:
@@ -54,38 +69,157 @@ class SiglentScope:
 
         try:
             # Query parameters
-            vdiv = self._parse_parameter(self.instr.query(f"c{channel}:vdiv?"))
-            ofst = self._parse_parameter(self.instr.query(f"c{channel}:ofst?"))
-            tdiv = self._parse_parameter(self.instr.query("tdiv?"))
-            sara = self._parse_sara(self.instr.query("sara?"))
+            meta = self._read_meta(channel)
 
             # Trigger waveform acquisition
             self.instr.write(f"c{channel}:wf? dat2")
-            raw_data = self.instr.read_raw()
+            data = self._parse_block(self.instr.read_raw())
 
-            # Process raw data
-            header_size = 15  # Adjust based on actual header length
-            data_bytes = list(raw_data[header_size:-2])  # Remove header and termination
-            
-            # Convert bytes to voltage values
-            volt_value = []
-            for byte in data_bytes:
-                # Handle two's complement for signed values
-                if byte > 127:
-                    byte -= 256
-                volt_value.append(byte / 25 * vdiv - ofst)
+            # Convert signed bytes to voltage values
+            volt_value = data / 25 * meta.vdiv - meta.offset
 
             # Generate time array
-            time_value = []
-            for idx in range(len(volt_value)):
-                time_data = -(tdiv * 14 / 2) + idx * (1 / sara)
-                time_value.append(time_data)
+            time_value = -(meta.tdiv * 14 / 2) + np.arange(data.size) / meta.sample_rate
 
+            meta.points = data.size
+            self.meta = meta
             return time_value, volt_value
 
         except pyvisa.VisaIOError as e:
             raise OscilloscopeError(f"Waveform acquisition failed: {str(e)}") from e
 
+    def configure_sequence(self, segments, enable=True):
+        """
+        Configure sequence (segmented memory) acquisition
+        :param segments: Number of segments captured per trigger burst
+        :param enable: Turn sequence mode on or off
+        """
+        if not self.instr:
+            raise ConnectionError("Not connected to oscilloscope")
+
+        if enable:
+            self.instr.write(f"seq on,{int(segments)}")
+            self.segments = int(segments)
+        else:
+            self.instr.write("seq off")
+            self.segments = None
+
+    def get_sequence(self, channel=1, segments=None, poll_interval=0.01, timeout=60):
+        """
+        Capture segments on hardware and read them back in one bulk transfer
+        :param channel: Channel index (1-4)
+        :param segments: Number of segments, defaults to the configure_sequence count
+        :param poll_interval: Delay between acquisition status polls in seconds
+        :param timeout: Maximum time to wait for all segments in seconds
+        :return: (time_array, volt_array, timestamps) where volt_array has
+                 shape (segments, points) and timestamps holds the trigger
+                 time of each segment in seconds relative to the first one
+        """
+        if not self.instr:
+            raise ConnectionError("Not connected to oscilloscope")
+
+        segments = self.segments if segments is None else int(segments)
+        if not segments or segments <= 0:
+            raise OscilloscopeError("Sequence mode not configured, call configure_sequence first")
+
+        try:
+            meta = self._read_meta(channel)
+
+            # Clear the stale acquisition flag, then arm once; the scope
+            # re-arms itself between segments
+            self.instr.query("inr?")
+            self.instr.write("trmd single")
+            deadline = time.time() + timeout
+            acquired = False
+            while True:
+                # INR bit 0 is set by this burst, so an earlier burst's Stop is not mistaken for it
+                acquired = acquired or int(self._parse_parameter(self.instr.query("inr?"))) & 1
+                if acquired and "Stop" in self.instr.query("sast?"):
+                    break
+                if time.time() > deadline:
+                    raise OscilloscopeError(
+                        f"Sequence acquisition of {segments} segments timed out")
+                time.sleep(poll_interval)
+
+            points = int(round(self._parse_parameter(self.instr.query(f"sanu? c{channel}"))))
+
+            # All segments normally come back concatenated in a single block
+            self.instr.write(f"c{channel}:wf? dat2")
+            data = self._parse_block(self.instr.read_raw())
+            if data.size == segments * points:
+                data = data.reshape(segments, points)
+                stamps = self._read_frames(channel, segments, points, read_data=False)[1]
+            elif data.size == points:
+                # Only the current frame was returned, read every frame from history
+                data, stamps = self._read_frames(channel, segments, points, read_data=True)
+            else:
+                raise OscilloscopeError(
+                    f"Received {data.size} points, expected {segments} segments "
+                    f"of {points} points")
+
+            volt_value = data / 25 * meta.vdiv - meta.offset
+            time_value = -(meta.tdiv * 14 / 2) + np.arange(points) / meta.sample_rate
+
+            meta.points = points
+            meta.segments = segments
+            self.meta = meta
+
+            return time_value, volt_value, stamps
+
+        except pyvisa.VisaIOError as e:
+            raise OscilloscopeError(f"Sequence acquisition failed: {str(e)}") from e
+
+    def _read_frames(self, channel, segments, points, read_data):
+        """
+        Step through the history frames for trigger times and, optionally, data
+        :return: (data of shape (segments, points) or None, timestamps)
+        """
+        self.instr.write("hsmd on")
+        try:
+            data = np.empty((segments, points), dtype=np.int8) if read_data else None
+            stamps = np.empty(segments)
+            for frame in range(segments):
+                self.instr.write(f"fram {frame + 1}")
+                stamps[frame] = self._parse_frame_time(self.instr.query("ftim?"))
+                if read_data:
+                    self.instr.write(f"c{channel}:wf? dat2")
+                    block = self._parse_block(self.instr.read_raw())
+                    if block.size != points:
+                        raise OscilloscopeError(
+                            f"Frame {frame + 1} has {block.size} points, expected {points}")
+                    data[frame] = block
+        finally:
+            self.instr.write("hsmd off")
+        # Frame times are time of day, unwrap bursts that cross midnight
+        steps = np.diff(stamps)
+        steps = np.where(steps < 0, steps + 86400, steps)
+        return data, np.concatenate(([0.0], np.cumsum(steps)))
+
+    @staticmethod
+    def _parse_frame_time(response):
+        """Parse a frame time ('hh:mm:ss.ffffff' or 'hh:mm:ss ffffff') into seconds"""
+        try:
+            parts = response.strip().replace(' ', '.').split(':')
+            hours, minutes = float(parts[-3]), float(parts[-2])
+            seconds = float(parts[-1].rstrip('s'))
+            return hours * 3600 + minutes * 60 + seconds
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"Failed to parse frame time from: '{response}'") from e
+
+    @staticmethod
+    def _parse_block(raw_data):
+        """Decode an IEEE 488.2 definite-length block into signed 8-bit samples"""
+        start = raw_data.find(b'#')
+        if start < 0:
+            raise OscilloscopeError("Missing block header in waveform data")
+        digits = int(raw_data[start + 1:start + 2])
+        length = int(raw_data[start + 2:start + 2 + digits])
+        offset = start + 2 + digits
+        if offset + length > len(raw_data):
+            raise OscilloscopeError(
+                f"Truncated waveform block: expected {length} bytes, got {len(raw_data) - offset}")
+        return np.frombuffer(raw_data, dtype=np.int8, count=length, offset=offset)
+
     def __enter__(self):
         self.connect()
         return self
@@ -96,7 +230,7 @@ class SiglentScope:
 class OscilloscopeError(Exception):
     pass
 
-# Usage example
+# Usage example, run from the repository root: python -m Siglent.SDS1104VISA
 if __name__ == "__main__":
     VISA_ADDRESS = "TCPIP::6.1.1.92::INSTR"  # Replace with your scope's address
     
@@ -110,6 +244,13 @@ if __name__ == "__main__":
             for t, v in zip(time_data[:10], volt_data[:10]):
                 print(f"{t:.6e}\t{v:.4f}")
 
+            # Capture a burst of 100 triggers into segmented memory
+            scope.configure_sequence(segments=100)
+            time_data, segments, stamps = scope.get_sequence(channel=1)
+            scope.configure_sequence(segments=100, enable=False)
+            print(f"Captured {segments.shape[0]} segments of {segments.shape[1]} points, "
+                  f"spanning {stamps[-1]:.6f} s")
+
     except ConnectionError as e:
         print(f"Connection error: {str(e)}")
     except OscilloscopeError as e:
@@ -4,6 +4,19 @@ from time import sleep
 from windfreak import SynthHD
 from time import sleep
 
+class ChannelStatus:
+    """Channel status snapshot, reused between polls instead of a fresh dict"""
+    __slots__ = ('frequency', 'power', 'phase', 'enabled', 'lock_status',
+                 'reference_doubler', 'charge_pump')
+
+    def __init__(self):
+        self.frequency = self.power = self.phase = None
+        self.enabled = self.lock_status = None
+        self.reference_doubler = self.charge_pump = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
 class WindfreakInitializer:
     def __init__(self, port, reference_mode='external', reference_frequency=10e6, 
                  channel_spacing=10, init_delay=1.0):
@@ -69,21 +82,26 @@ class WindfreakInitializer:
         ch.phase = phase
         ch.enable = enable
 
-    def get_status(self, channel=0):
-        """Get channel status information"""
+    def get_status(self, channel=0, out=None):
+        """
+        Get channel status information
+        :param channel: Channel index (0 or 1)
+        :param out: Optional ChannelStatus to fill in place
+        :return: ChannelStatus, also indexable like the former dict
+        """
         if not self._connected:
             raise ConnectionError("Device not connected")
             
         ch = self.synth[channel]
-        return {
-            'frequency': ch.frequency,
-            'power': ch.power,
-            'phase': ch.phase,
-            'enabled': ch.enable,
-            'lock_status': ch.lock_status,
-            'reference_doubler': self.synth._query("b?"),
-            'charge_pump': self.synth._query("U?")
-        }
+        status = out if out is not None else ChannelStatus()
+        status.frequency = ch.frequency
+        status.power = ch.power
+        status.phase = ch.phase
+        status.enabled = ch.enable
+        status.lock_status = ch.lock_status
+        status.reference_doubler = self.synth._query("b?")
+        status.charge_pump = self.synth._query("U?")
+        return status
 
     def disconnect(self):
         """Close connection and cleanup"""
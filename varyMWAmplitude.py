@@ -1,6 +1,7 @@
 from Windfreak.Windfreak import WindfreakInitializer
 from AnritsuMS2712B.AnritsuMS2721B import AnritsuMS2721B
 from LabJack.LabJack import LabJackReader
+from Records.Records import RecordBuffer, SWEEP_DTYPE
 from datetime import datetime
 import csv
 import time
@@ -55,6 +56,10 @@ if voltage is not None:
 # Define the column headers (this will be written only once)
 columns = ['time', 'output MW power (dBm)', 'PD DC voltage (V)', 'PD MW power (dBm)']
 
+# Pre-allocated sample store for one setpoint, filled in the inner loop and
+# dumped to the CSV file before the next setpoint reuses it
+records = RecordBuffer(SWEEP_DTYPE)
+
 # Open the file in append mode so that data is added continuously
 with open('varyMWAmplitude.csv', 'a', newline='') as file:
     writer = csv.writer(file)
@@ -70,19 +75,20 @@ with open('varyMWAmplitude.csv', 'a', newline='') as file:
     for wfp in windfreak_power:
         wf.synth[0].power = wfp
         time.sleep(1)
+        records.clear()
         for _ in range(average_num):  # You can replace 10 with a condition for continuous collection
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Format the time as YYYY-MM-DD HH:MM:SS
-
-            output_mw_power = wfp
             dc_voltage = lj_reader.read_voltage(channel=LABJACK_CHANNEL)  # Read voltage from AIN4, V
             mw_power = sa.get_marker_y(1) #dBm
             
-            # Prepare the row to be written
-            row = [current_time, output_mw_power, dc_voltage, mw_power]
-            
-            # Write the row to the CSV file
-            writer.writerow(row)
+            # Write the sample into the next pre-allocated slot
+            records.append(time.time(), wfp,
+                           np.nan if dc_voltage is None else dc_voltage, mw_power)
+
+        # Format and write this setpoint's rows; a failed LabJack read (NaN) stays an empty field
+        block = [column.tolist() for column in records.columns().values()]
+        writer.writerows(
+            (datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S'), p, '' if v != v else v, m)  # Format the time as YYYY-MM-DD HH:MM:SS
+            for t, p, v, m in zip(*block))
 
-            # Flush the file buffer to ensure data is written immediately
-            file.flush()
-            
\ No newline at end of file
+        # Flush the file buffer to ensure data is written after every setpoint
+        file.flush()